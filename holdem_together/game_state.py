@@ -1,50 +1,40 @@
 from __future__ import annotations
 
 import functools
+import os
 import random
 from typing import Any
 
-from .poker_eval import HandStrength, best_of_7, rank_5, _compare_hand_strength
+from .poker_eval import CARD_ID, HandStrength, best_hand, best_of_7, parse_card
+
+# Vectorized equity is opt-in rather than switched on by installing NumPy: it
+# draws from a different RNG than the scalar loop, so the same seed gives a
+# different equity_estimate (and so a different match) on each path. NumPy is
+# only imported when asked for, keeping the default import cheap.
+USE_NUMPY_EQUITY = os.environ.get("HOLD_EM_NUMPY_EQUITY", "").lower() in ("1", "true", "yes")
+if USE_NUMPY_EQUITY:
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("HOLD_EM_NUMPY_EQUITY is set but numpy is not installed") from None
+
+    from .poker_eval_np import best_of_7_np
+
+# Equity samples for demo/live matches. With NumPy the demo uses 5x the
+# samples for roughly 2x the wall time of the scalar path at 20 (NumPy only
+# overtakes the scalar loop at much larger sample counts).
+DEMO_EQUITY_SAMPLES = 100 if USE_NUMPY_EQUITY else 20
 
 
 def _current_made_hand(hole_cards: list[str], board_cards: list[str]) -> HandStrength:
     cards = hole_cards + board_cards
     if len(cards) >= 5:
         # Best 5-card hand from available known cards.
-        best: HandStrength | None = None
-        import itertools
-
-        for combo in itertools.combinations(cards, 5):
-            hs = rank_5(list(combo))
-            if best is None:
-                best = hs
-            else:
-                # compare via tuple of (category_index, rank)
-                order = {
-                    "high_card": 0,
-                    "pair": 1,
-                    "two_pair": 2,
-                    "three_of_a_kind": 3,
-                    "straight": 4,
-                    "flush": 5,
-                    "full_house": 6,
-                    "four_of_a_kind": 7,
-                    "straight_flush": 8,
-                }
-                a = (order[hs.category], hs.rank)
-                b = (order[best.category], best.rank)
-                if a > b:
-                    best = hs
-        assert best is not None
-        return best
+        return best_hand(cards)
 
     # Not enough cards for a real 5-card evaluation.
     # Return a simple high-card snapshot.
-    ranks = []
-    for c in cards:
-        r = c[0]
-        ranks.append("23456789TJQKA".index(r) + 2)
-    ranks.sort(reverse=True)
+    ranks = sorted((parse_card(c)[0] for c in cards), reverse=True)
     return HandStrength(category="high_card", rank=tuple(ranks))
 
 
@@ -65,6 +55,8 @@ def _equity_cached(
 ) -> float:
     if opponents <= 0:
         return 1.0
+    if USE_NUMPY_EQUITY:
+        return _equity_np(hole, board, opponents, samples, seed)
     known = set(hole) | set(board)
     deck = _make_deck_excluding(known)
     rng = random.Random(seed)
@@ -73,14 +65,18 @@ def _equity_cached(
     need_board = 5 - len(board)
     # Pre-compute how many cards we need per sample
     cards_per_sample = need_board + opponents * 2
-    
+    # On the river the hero's hand is the same in every sample.
+    river_score = best_of_7(hole + board).score if need_board == 0 else None
+
     for _ in range(samples):
         # Use sample() instead of shuffle() - only pick what we need
         drawn = rng.sample(deck, cards_per_sample)
         
         runout = list(board) + drawn[:need_board]
-        hero7 = tuple(hole) + tuple(runout)
-        hero_best = best_of_7(hero7)
+        if river_score is None:
+            hero_score = best_of_7(tuple(hole) + tuple(runout)).score
+        else:
+            hero_score = river_score
 
         hero_beats_all = True
         hero_ties = True
@@ -89,14 +85,13 @@ def _equity_cached(
             opp_hole = (drawn[idx], drawn[idx + 1])
             idx += 2
             opp7 = opp_hole + tuple(runout)
-            opp_best = best_of_7(opp7)
-            
-            cmp = _compare_hand_strength(hero_best, opp_best)
-            if cmp < 0:
+            opp_score = best_of_7(opp7).score
+
+            if opp_score > hero_score:
                 hero_beats_all = False
                 hero_ties = False
                 break
-            if cmp != 0:
+            if opp_score != hero_score:
                 hero_ties = False
 
         if hero_beats_all and not hero_ties:
@@ -107,6 +102,43 @@ def _equity_cached(
     return float(wins / samples) if samples > 0 else 0.0
 
 
+def _equity_np(
+    hole: tuple[str, str],
+    board: tuple[str, ...],
+    opponents: int,
+    samples: int,
+    seed: int,
+) -> float:
+    # All samples are dealt and evaluated at once: each row of `drawn` is one
+    # shuffled deck supplying the rest of the board, then opponent hole cards.
+    if samples <= 0:
+        return 0.0
+    deck = np.array([CARD_ID[c] for c in _make_deck_excluding(set(hole) | set(board))], dtype=np.int8)
+    rng = np.random.default_rng(seed)
+    drawn = rng.permuted(np.tile(deck, (samples, 1)), axis=1)
+
+    need_board = 5 - len(board)
+    known_board = np.tile(np.array([CARD_ID[c] for c in board], dtype=np.int8), (samples, 1))
+    runout = np.concatenate([known_board, drawn[:, :need_board]], axis=1)
+
+    hero_hole = np.tile(np.array([CARD_ID[c] for c in hole], dtype=np.int8), (samples, 1))
+    hero = best_of_7_np(np.concatenate([hero_hole, runout], axis=1))[:, None]
+    opp = np.stack(
+        [
+            best_of_7_np(np.concatenate([drawn[:, need_board + 2 * i : need_board + 2 * i + 2], runout], axis=1))
+            for i in range(opponents)
+        ],
+        axis=1,
+    )
+
+    # Same scoring as the scalar loop: a win unless someone is ahead, half a
+    # win only when every opponent ties.
+    beats_all = (opp <= hero).all(axis=1)
+    ties_all = (opp == hero).all(axis=1)
+    wins = np.count_nonzero(beats_all & ~ties_all) + 0.5 * np.count_nonzero(ties_all)
+    return float(wins / samples)
+
+
 def estimate_equity(
     hole_cards: list[str],
     board_cards: list[str],
@@ -122,7 +154,9 @@ def estimate_equity(
     """
     if len(hole_cards) != 2:
         return 0.0
-    return _equity_cached(tuple(hole_cards), tuple(board_cards), opponents, samples, seed)
+    # The estimate does not depend on card order, so sort for a canonical
+    # cache key: the same cards in a different order share one entry.
+    return _equity_cached(tuple(sorted(hole_cards)), tuple(sorted(board_cards)), opponents, samples, seed)
 
 
 def make_bot_visible_state(
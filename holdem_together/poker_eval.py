@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import functools
 import itertools
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 
 RANKS = "23456789TJQKA"
 SUITS = "cdhs"  # clubs, diamonds, hearts, spades
@@ -16,9 +17,18 @@ _VALID_SUITS = frozenset(SUITS)
 class HandStrength:
     category: str
     rank: tuple[int, ...]
+    # Single comparable int (higher = stronger): category index packed above
+    # up to five 4-bit rank nibbles, most significant first.
+    score: int = field(init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        packed = 0
+        for i, r in enumerate(self.rank[:5]):
+            packed |= r << (4 * (4 - i))
+        object.__setattr__(self, "score", (_CATEGORY_ORDER[self.category] << 24) | packed)
 
-_CATEGORY = [
+
+_CATEGORY = (
     "high_card",
     "pair",
     "two_pair",
@@ -28,7 +38,7 @@ _CATEGORY = [
     "full_house",
     "four_of_a_kind",
     "straight_flush",
-]
+)
 
 # Pre-compute category ordering for comparisons
 _CATEGORY_ORDER = {cat: i for i, cat in enumerate(_CATEGORY)}
@@ -47,114 +57,289 @@ for _r in RANKS:
 
 
 def parse_card(card: str) -> tuple[int, str]:
-    result = _CARD_CACHE.get(card)
-    if result is not None:
-        return result
-    raise ValueError(f"Invalid card: {card}")
-
-
-def _is_straight(ranks_desc: list[int]) -> tuple[bool, int]:
-    # ranks_desc is unique ranks sorted desc
-    if len(ranks_desc) < 5:
-        return False, 0
-    # wheel
-    if ranks_desc[:4] == [14, 5, 4, 3] and 2 in ranks_desc:
-        return True, 5
-    for i in range(len(ranks_desc) - 4):
-        window = ranks_desc[i : i + 5]
-        if window[0] - window[4] == 4 and len(set(window)) == 5:
-            return True, window[0]
-    return False, 0
-
-
-@functools.lru_cache(maxsize=500_000)
-def _rank_5_cached(cards: tuple[str, ...]) -> HandStrength:
-    parsed = [_CARD_CACHE[c] for c in cards]
-    ranks = sorted((r for r, _ in parsed), reverse=True)
-    suits = [s for _, s in parsed]
-    is_flush = suits[0] == suits[1] == suits[2] == suits[3] == suits[4]
-
-    counts: dict[int, int] = {}
-    for r in ranks:
-        counts[r] = counts.get(r, 0) + 1
-
-    groups = sorted(((cnt, r) for r, cnt in counts.items()), reverse=True)
-    unique_ranks_desc = sorted(counts.keys(), reverse=True)
-    is_straight, top = _is_straight(unique_ranks_desc)
-
-    if is_flush and is_straight:
-        return HandStrength("straight_flush", (top,))
+    try:
+        return _CARD_CACHE[card]
+    except KeyError:
+        raise ValueError(f"Invalid card: {card}") from None
 
-    if groups[0][0] == 4:
-        quad = groups[0][1]
-        kicker = max(r for r in unique_ranks_desc if r != quad)
-        return HandStrength("four_of_a_kind", (quad, kicker))
 
-    if groups[0][0] == 3 and len(groups) > 1 and groups[1][0] >= 2:
-        trips = groups[0][1]
-        pair = max(r for cnt, r in groups[1:] if cnt >= 2)
-        return HandStrength("full_house", (trips, pair))
+# (13-bit rank mask, top card) for every straight, best first; bit 0 is a deuce.
+STRAIGHT_MASKS = tuple((0b11111 << (top - 6), top) for top in range(14, 5, -1)) + ((0b1000000001111, 5),)
 
-    if is_flush:
-        return HandStrength("flush", tuple(sorted(ranks, reverse=True)))
 
-    if is_straight:
-        return HandStrength("straight", (top,))
+def _is_straight(ranks: list[int]) -> tuple[bool, int]:
+    mask = 0
+    for r in ranks:
+        mask |= 1 << (r - 2)
+    for sm, top in STRAIGHT_MASKS:
+        if (mask & sm) == sm:
+            return True, top
+    return False, 0
 
-    if groups[0][0] == 3:
-        trips = groups[0][1]
-        kickers = sorted([r for r in unique_ranks_desc if r != trips], reverse=True)[:2]
-        return HandStrength("three_of_a_kind", (trips, *kickers))
 
-    if groups[0][0] == 2:
-        pairs = sorted([r for cnt, r in groups if cnt == 2], reverse=True)
-        if len(pairs) >= 2:
-            hi, lo = pairs[0], pairs[1]
-            kicker = max(r for r in unique_ranks_desc if r not in (hi, lo))
-            return HandStrength("two_pair", (hi, lo, kicker))
-        pair = pairs[0]
-        kickers = sorted([r for r in unique_ranks_desc if r != pair], reverse=True)[:3]
-        return HandStrength("pair", (pair, *kickers))
+# Cactus Kev card encoding: one 32-bit int per card laid out as
+#   xxxbbbbb bbbbbbbb ssssrrrr xxpppppp
+# (b = one bit per rank, s = one-hot suit, r = rank index, p = rank prime).
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_SUIT_BITS = {"c": 0x1, "d": 0x2, "h": 0x4, "s": 0x8}
 
-    return HandStrength("high_card", tuple(sorted(ranks, reverse=True)))
+CARD_INT: dict[str, int] = {}
+for _i, _r in enumerate(RANKS):
+    for _s in SUITS:
+        CARD_INT[_r + _s] = (1 << (16 + _i)) | (_SUIT_BITS[_s] << 12) | (_i << 8) | _PRIMES[_i]
+
+
+# Category of a non-flush, non-straight 5-card hand by sorted rank counts.
+CATEGORY_FROM_SIG = {
+    (4, 1): "four_of_a_kind",
+    (3, 2): "full_house",
+    (3, 1, 1): "three_of_a_kind",
+    (2, 2, 1): "two_pair",
+    (2, 1, 1, 1): "pair",
+    (1, 1, 1, 1, 1): "high_card",
+}
+
+
+def _build_lookup_tables() -> tuple[dict[int, int], dict[int, int], list[HandStrength]]:
+    """Enumerate the 7462 distinct 5-card hand classes.
+
+    Scores run 1..7462 with higher = stronger. Flush-keyed classes are indexed
+    by their 13-bit rank mask, everything else by the product of rank primes.
+    """
+    flush_keyed: list[tuple[HandStrength, int]] = []
+    prime_keyed: list[tuple[HandStrength, int]] = []
+    desc = range(12, -1, -1)
+
+    for combo in itertools.combinations(desc, 5):
+        values = [i + 2 for i in combo]
+        bits = 0
+        product = 1
+        for i in combo:
+            bits |= 1 << i
+            product *= _PRIMES[i]
+        is_straight, top = _is_straight(values)
+        if is_straight:
+            flush_keyed.append((HandStrength("straight_flush", (top,)), bits))
+            prime_keyed.append((HandStrength("straight", (top,)), product))
+        else:
+            flush_keyed.append((HandStrength("flush", tuple(values)), bits))
+            prime_keyed.append((HandStrength("high_card", tuple(values)), product))
+
+    # Paired hands: the category follows from the rank-count signature alone.
+    # Ranks sharing a count are picked in descending order, which yields the
+    # tiebreak tuple directly (group ranks first, then kickers).
+    def pick(runs: list[tuple[int, int]], avail: list[int]):
+        if not runs:
+            yield ()
+            return
+        for chosen in itertools.combinations(avail, runs[0][1]):
+            rest = [r for r in avail if r not in chosen]
+            for tail in pick(runs[1:], rest):
+                yield chosen + tail
+
+    for sig, category in CATEGORY_FROM_SIG.items():
+        if sig == (1, 1, 1, 1, 1):
+            continue  # high cards / straights are enumerated above
+        runs = [(n, len(list(group))) for n, group in itertools.groupby(sig)]
+        for ranks in pick(runs, list(desc)):
+            product = 1
+            for r, n in zip(ranks, sig):
+                product *= _PRIMES[r] ** n
+            prime_keyed.append((HandStrength(category, tuple(r + 2 for r in ranks)), product))
+
+    classes = [(hs, key, True) for hs, key in flush_keyed] + [(hs, key, False) for hs, key in prime_keyed]
+    classes.sort(key=lambda e: (_CATEGORY_ORDER[e[0].category], e[0].rank))
+
+    flush_lookup: dict[int, int] = {}
+    unsuited_lookup: dict[int, int] = {}
+    strengths: list[HandStrength] = [HandStrength("high_card", ())]  # index 0 unused
+    for score, (hs, key, flush) in enumerate(classes, start=1):
+        (flush_lookup if flush else unsuited_lookup)[key] = score
+        strengths.append(hs)
+    return flush_lookup, unsuited_lookup, strengths
+
+
+# Dense card ids 0..51 (rank index * 4 + suit index).
+CARD_ID: dict[str, int] = {c: i for i, c in enumerate(CARD_INT)}
+_CARD_INT_BY_ID = tuple(CARD_INT.values())
+
+
+def parse_cards_to_ints(cards: list[str] | tuple[str, ...]) -> tuple[int, ...]:
+    return tuple(CARD_INT[c] for c in cards)
+
+
+def _score_5(c0: int, c1: int, c2: int, c3: int, c4: int) -> int:
+    try:
+        if c0 & c1 & c2 & c3 & c4 & 0xF000:
+            return FLUSH_LOOKUP[(c0 | c1 | c2 | c3 | c4) >> 16]
+        return UNSUITED_LOOKUP[(c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF)]
+    except KeyError:
+        if not _build_tables():
+            raise
+        return _score_5(c0, c1, c2, c3, c4)
+
+
+def _rank_5_ints(card_ints: tuple[int, ...]) -> int:
+    return _score_5(*card_ints)
 
 
 def rank_5(cards: list[str]) -> HandStrength:
-    # Use cached version with tuple
-    return _rank_5_cached(tuple(sorted(cards)))
+    return _STRENGTHS[_rank_5_ints(parse_cards_to_ints(cards))]
+
+
+# 7-card perfect hash (Henry Lee's PokerHandEvaluator). A non-flush hand is
+# a 13-digit base-5 "quinary" of rank counts; _DP[d][n][k] counts the quinaries
+# of length n summing to k - d' for every digit d' < d, so summing it along the
+# vector yields that vector's lexicographic index among all with the same sum.
+def _build_dp() -> list[list[list[int]]]:
+    count = [[0] * 8 for _ in range(14)]
+    count[0][0] = 1
+    for n in range(1, 14):
+        for k in range(8):
+            count[n][k] = sum(count[n - 1][k - d] for d in range(min(k, 4) + 1))
+    return [
+        [[sum(count[n][k - d] for d in range(min(q, k + 1))) for k in range(8)] for n in range(14)]
+        for q in range(5)
+    ]
+
+
+_DP = _build_dp()
+
+
+def _hash_quinary(q: list[int], k: int) -> int:
+    h = 0
+    for i in range(13):
+        d = q[i]
+        if d:
+            h += _DP[d][12 - i][k]
+            k -= d
+            if k <= 0:
+                break
+    return h
+
+
+def _build_7_card_tables() -> tuple[list[int], list[int]]:
+    # FLUSH7[rank mask of the flush suit] -> best flush / straight flush score.
+    # Masks are visited in ascending order, so every subset is filled first.
+    flush7 = [0] * (1 << 13)
+    for bits, score in FLUSH_LOOKUP.items():
+        flush7[bits] = score
+    for mask in range(1 << 13):
+        if 5 < mask.bit_count() <= 7:
+            flush7[mask] = max(flush7[mask & ~(1 << i)] for i in range(13) if mask >> i & 1)
+
+    # Best non-flush score for every 6- and 7-card rank multiset, keyed by
+    # prime product: the best of n cards is the best of its (n-1)-subsets.
+    best = UNSUITED_LOOKUP
+    for _ in range(2):
+        wider: dict[int, int] = {}
+        for product, score in best.items():
+            for prime in _PRIMES:
+                if product % prime**4:
+                    key = product * prime
+                    if wider.get(key, 0) < score:
+                        wider[key] = score
+        best = wider
+
+    # NOFLUSH7[hash_quinary(rank counts)]; quinaries are visited in
+    # lexicographic order, i.e. in hash order.
+    noflush7: list[int] = []
+
+    def fill(i: int, left: int, product: int) -> None:
+        if i == 12:
+            if left <= 4:
+                noflush7.append(best[product * _PRIMES[12] ** left])
+            return
+        prime = _PRIMES[i]
+        for d in range(min(left, 4) + 1):
+            fill(i + 1, left - d, product * prime**d)
+
+    fill(0, 7, 1)
+    return flush7, noflush7
+
+
+# The tables take ~0.2 s to build, so they are filled in place on the first
+# evaluation rather than at import: every bot sandbox child imports this
+# package. _STRENGTHS is filled first and NOFLUSH7 last, so a score found in
+# any table always has its HandStrength, and a non-empty NOFLUSH7 means built.
+FLUSH_LOOKUP: dict[int, int] = {}
+UNSUITED_LOOKUP: dict[int, int] = {}
+_STRENGTHS: list[HandStrength] = []
+FLUSH7: list[int] = []
+NOFLUSH7: list[int] = []
+_TABLES_LOCK = threading.Lock()
+
+
+def _build_tables() -> bool:
+    """Fill the lookup tables if needed; False if they were already built."""
+    if NOFLUSH7:
+        return False
+    with _TABLES_LOCK:
+        if not NOFLUSH7:
+            flush_lookup, unsuited_lookup, strengths = _build_lookup_tables()
+            _STRENGTHS[:] = strengths
+            FLUSH_LOOKUP.update(flush_lookup)
+            UNSUITED_LOOKUP.update(unsuited_lookup)
+            flush7, noflush7 = _build_7_card_tables()
+            FLUSH7[:] = flush7
+            NOFLUSH7[:] = noflush7
+    return True
+
+
+@functools.lru_cache(maxsize=1 << 17)
+def _best_of_7_key(key: int) -> int:
+    # One pass fills a rank mask per suit (indexed by the one-hot suit bit)
+    # and the per-rank counts for the quinary hash.
+    suit_masks = [0] * 9
+    q = [0] * 13
+    for shift in (0, 6, 12, 18, 24, 30, 36):
+        c = _CARD_INT_BY_ID[(key >> shift) & 0x3F]
+        suit_masks[(c >> 12) & 0xF] |= c >> 16
+        q[(c >> 8) & 0xF] += 1
+    for s in (1, 2, 4, 8):
+        if suit_masks[s].bit_count() >= 5:
+            return FLUSH7[suit_masks[s]]
+    return NOFLUSH7[_hash_quinary(q, 7)]
 
 
-@functools.lru_cache(maxsize=100_000)
-def _best_of_7_cached(cards7: tuple[str, ...]) -> HandStrength:
+def best_of_7(cards7: tuple[str, ...] | list[str]) -> HandStrength:
     if len(cards7) != 7:
         raise ValueError("best_of_7 requires 7 cards")
-    best: HandStrength | None = None
-    best_rank: tuple[int, tuple[int, ...]] | None = None
-    
-    for combo in itertools.combinations(cards7, 5):
-        hs = _rank_5_cached(tuple(sorted(combo)))
-        hs_rank = (_CATEGORY_ORDER[hs.category], hs.rank)
-        if best_rank is None or hs_rank > best_rank:
-            best = hs
-            best_rank = hs_rank
-    assert best is not None
-    return best
-
-
-def best_of_7(cards7: tuple[str, ...] | list[str]) -> HandStrength:
-    if isinstance(cards7, list):
-        cards7 = tuple(cards7)
-    return _best_of_7_cached(cards7)
+    # Order-independent cache key: the seven sorted 6-bit card ids.
+    i0, i1, i2, i3, i4, i5, i6 = sorted([CARD_ID[c] for c in cards7])
+    key = i0 | i1 << 6 | i2 << 12 | i3 << 18 | i4 << 24 | i5 << 30 | i6 << 36
+    try:
+        return _STRENGTHS[_best_of_7_key(key)]
+    except IndexError:
+        if not _build_tables():
+            raise
+        return _STRENGTHS[_best_of_7_key(key)]
+
+
+# Index tuples for the six 5-card subsets of 6 known cards (turn decisions).
+C6_5 = tuple(itertools.combinations(range(6), 5))
+
+
+def best_hand(cards: list[str]) -> HandStrength:
+    """Best 5-card hand from 5 to 7 known cards."""
+    if len(cards) == 7:
+        return best_of_7(cards)
+    if len(cards) == 5:
+        return rank_5(cards)
+    if len(cards) != 6:
+        raise ValueError("best_hand requires 5 to 7 cards")
+    c = parse_cards_to_ints(cards)
+    score_5 = _score_5
+    best = 0
+    for i0, i1, i2, i3, i4 in C6_5:
+        score = score_5(c[i0], c[i1], c[i2], c[i3], c[i4])
+        if score > best:
+            best = score
+    return _STRENGTHS[best]
 
 
 def _compare_hand_strength(a: HandStrength, b: HandStrength) -> int:
-    ai = _CATEGORY_ORDER[a.category]
-    bi = _CATEGORY_ORDER[b.category]
-    if ai != bi:
-        return 1 if ai > bi else -1
-    if a.rank != b.rank:
-        return 1 if a.rank > b.rank else -1
-    return 0
+    return (a.score > b.score) - (a.score < b.score)
 
 
 def compare_best_of_7(cards7_a: list[str], cards7_b: list[str]) -> int:
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from .poker_eval import FLUSH7, NOFLUSH7, _DP, _build_tables
+
+# NumPy is optional: callers check NUMPY_AVAILABLE and keep a pure-Python path.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+if NUMPY_AVAILABLE:
+    _build_tables()
+    _FLUSH7 = np.array(FLUSH7, dtype=np.int32)
+    _NOFLUSH7 = np.array(NOFLUSH7, dtype=np.int32)
+    _DP_NP = np.array(_DP, dtype=np.int32)
+    _RANK_BITS = np.left_shift(1, np.arange(13, dtype=np.int32))
+
+    def best_of_7_np(card_ids):
+        """Scores (1..7462, higher = stronger) for an (N, 7) array of card ids."""
+        card_ids = np.asarray(card_ids)
+        ranks = card_ids >> 2
+        suits = card_ids & 3
+        rank_bits = _RANK_BITS[ranks]
+
+        # Flush: rank mask of the (only possible) suit holding five or more.
+        suit_counts = np.stack([(suits == s).sum(axis=1) for s in range(4)], axis=1)
+        flush_suit = suit_counts.argmax(axis=1)
+        has_flush = suit_counts.max(axis=1) >= 5
+        flush_mask = np.where(suits == flush_suit[:, None], rank_bits, 0).sum(axis=1)
+
+        # Non-flush: quinary hash of the rank counts, one column at a time.
+        counts = np.stack([(ranks == r).sum(axis=1) for r in range(13)], axis=1)
+        k = np.full(len(card_ids), 7)
+        h = np.zeros(len(card_ids), dtype=np.int64)
+        for i in range(13):
+            d = counts[:, i]
+            h += _DP_NP[d, 12 - i, k]
+            k -= d
+
+        return np.where(has_flush, _FLUSH7[flush_mask], _NOFLUSH7[h])
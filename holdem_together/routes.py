@@ -1,55 +1,70 @@
 from __future__ import annotations
 
-import hashlib
 import random
 import json
 import time
 
 from flask import Blueprint, redirect, render_template, request, url_for, Response, stream_with_context
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
 
 from .bot_sandbox import BotRunResult, run_bot_action, run_bot_action_fast, validate_bot_code
 from .db import Bot, BotVersion, Match, MatchBotLog, MatchHand, MatchResult, Rating, User, db
 from .ratings import EloConfig, clamp_rating, update_elo_pairwise
-from .game_state import make_bot_visible_state, normalize_action
+from .services import _hash_code, ensure_ratings_exist
+from .game_state import DEMO_EQUITY_SAMPLES, make_bot_visible_state, normalize_action
 from .tournament import MatchConfig, run_match
 from .engine import TableConfig, simulate_hand
 
 
+# orjson is optional; it encodes the per-hand replay payloads several times
+# faster than the stdlib encoder and is used when installed.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
 bp = Blueprint("web", __name__)
 
 
-def _hash_code(code: str) -> str:
-    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+def _je(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
 
 
 @bp.get("/")
 def index():
     # Ensure every bot has a rating row (lazy safety for older DBs).
-    for b in Bot.query.all():
-        if db.session.get(Rating, b.id) is None:
-            db.session.add(Rating(bot_id=b.id, rating=1500.0, matches_played=0))
-    db.session.commit()
-
-    bots = (
-        db.session.query(Bot)
-        .outerjoin(Rating, Rating.bot_id == Bot.id)
-        .order_by(Rating.rating.desc().nullslast(), Bot.updated_at.desc())
-        .all()
-    )
+    ensure_ratings_exist()
 
-    rows = (
+    # One round trip: bots with their owner, rating and aggregated results.
+    totals = (
         db.session.query(
-            MatchResult.bot_id,
+            MatchResult.bot_id.label("bot_id"),
             func.sum(MatchResult.chips_won).label("chips"),
             func.count(MatchResult.id).label("matches"),
         )
         .group_by(MatchResult.bot_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(Bot, Rating.rating, totals.c.chips, totals.c.matches)
+        .options(joinedload(Bot.user))
+        .outerjoin(Rating, Rating.bot_id == Bot.id)
+        .outerjoin(totals, totals.c.bot_id == Bot.id)
+        .order_by(Rating.rating.desc().nullslast(), Bot.updated_at.desc())
         .all()
     )
-    agg = {int(r.bot_id): {"chips": int(r.chips or 0), "matches": int(r.matches or 0)} for r in rows}
 
-    rating_map = {int(r.bot_id): float(r.rating) for r in Rating.query.all()}
+    bots = [r[0] for r in rows]
+    agg = {
+        int(b.id): {"chips": int(chips or 0), "matches": int(matches or 0)}
+        for b, _, chips, matches in rows
+        if matches is not None
+    }
+    rating_map = {int(b.id): float(rating) for b, rating, _, _ in rows if rating is not None}
     return render_template("index.html", bots=bots, agg=agg, rating_map=rating_map)
 
 
@@ -62,9 +77,17 @@ def matches_index():
 @bp.get("/matches/<int:match_id>")
 def match_detail(match_id: int):
     match = Match.query.get_or_404(match_id)
-    results = MatchResult.query.filter_by(match_id=match_id).order_by(MatchResult.chips_won.desc()).all()
+    results = (
+        MatchResult.query.options(joinedload(MatchResult.bot).joinedload(Bot.user))
+        .filter_by(match_id=match_id)
+        .order_by(MatchResult.chips_won.desc())
+        .all()
+    )
 
-    logs_rows = MatchBotLog.query.filter_by(match_id=match_id).all()
+    # Logs and hands are only read as plain columns; skip ORM object hydration.
+    logs_rows = db.session.execute(
+        select(MatchBotLog.seat, MatchBotLog.logs, MatchBotLog.errors).where(MatchBotLog.match_id == match_id)
+    ).all()
     logs_by_seat: dict[int, dict[str, str]] = {}
     for lr in logs_rows:
         logs_by_seat[int(lr.seat)] = {
@@ -72,7 +95,20 @@ def match_detail(match_id: int):
             "errors": lr.errors or "",
         }
 
-    hands = MatchHand.query.filter_by(match_id=match_id).order_by(MatchHand.hand_index.asc()).all()
+    hands = db.session.execute(
+        select(
+            MatchHand.hand_index,
+            MatchHand.hand_seed,
+            MatchHand.dealer_seat,
+            MatchHand.board_json,
+            MatchHand.actions_json,
+            MatchHand.winners_json,
+            MatchHand.delta_stacks_json,
+            MatchHand.side_pots_json,
+        )
+        .where(MatchHand.match_id == match_id)
+        .order_by(MatchHand.hand_index.asc())
+    ).all()
     hand_rows = [
         {
             "hand_index": int(h.hand_index),
@@ -146,8 +182,16 @@ def bot_detail(bot_id: int):
         elif action == "submit":
             if ok:
                 bot.status = "submitted"
-                ch = _hash_code(code)
-                db.session.add(BotVersion(bot_id=bot.id, code_hash=ch, code=code))
+                # Re-submitting unchanged code doesn't add a new version.
+                # Compare the source itself: older rows hold SHA-256 hashes.
+                latest = (
+                    db.session.query(BotVersion.code)
+                    .filter_by(bot_id=bot.id)
+                    .order_by(BotVersion.id.desc())
+                    .first()
+                )
+                if latest is None or latest.code != code:
+                    db.session.add(BotVersion(bot_id=bot.id, code_hash=_hash_code(code), code=code))
                 msg = "Submitted."
             else:
                 msg = "Fix validation errors before submitting."
@@ -177,17 +221,29 @@ def bot_detail(bot_id: int):
                 demo_logs: list[dict] = []
                 logs_by_seat: dict[int, list[str]] = {i: [] for i in range(len(table_bots))}
                 errors_by_seat: dict[int, list[str]] = {i: [] for i in range(len(table_bots))}
-
-                def _append_block(buf: list[str], block: str, *, max_chars: int = 20_000) -> None:
+                # Running len("\n".join(buf)) per seat, so appends don't re-join.
+                log_chars: dict[int, int] = {i: 0 for i in range(len(table_bots))}
+                error_chars: dict[int, int] = {i: 0 for i in range(len(table_bots))}
+
+                def _append_block(
+                    bufs: dict[int, list[str]],
+                    chars: dict[int, int],
+                    seat: int,
+                    block: str,
+                    *,
+                    max_chars: int = 20_000,
+                ) -> None:
                     if not block:
                         return
+                    buf = bufs[seat]
+                    chars[seat] += len(block) + (1 if buf else 0)
                     buf.append(block)
-                    joined = "\n".join(buf)
-                    if len(joined) > max_chars:
+                    if chars[seat] > max_chars:
                         # Keep the tail to preserve latest context.
-                        tail = joined[-max_chars:]
+                        tail = "\n".join(buf)[-max_chars:]
                         buf.clear()
                         buf.append(tail)
+                        chars[seat] = len(tail)
 
                 def _decide(code_str: str, gs: dict):
                     # Use fast in-process execution for demos (code is already validated).
@@ -197,7 +253,7 @@ def bot_detail(bot_id: int):
                     if res.ok and res.action is not None:
                         if res.logs:
                             header = f"--- {gs.get('hand_id')} {gs.get('street')} seat={seat} ---\n"
-                            _append_block(logs_by_seat[seat], header + res.logs.rstrip())
+                            _append_block(logs_by_seat, log_chars, seat, header + res.logs.rstrip())
 
                             # Also surface primary bot logs inline on the demo panel for quick debugging.
                             if seat == 0:
@@ -212,7 +268,7 @@ def bot_detail(bot_id: int):
 
                     if res.error:
                         header = f"--- {gs.get('hand_id')} {gs.get('street')} seat={seat} ERROR ---\n"
-                        _append_block(errors_by_seat[seat], header + res.error.rstrip(), max_chars=30_000)
+                        _append_block(errors_by_seat, error_chars, seat, header + res.error.rstrip(), max_chars=30_000)
 
                     # fallback action on bot failure
                     legal = {a["type"]: a for a in gs.get("legal_actions", [])}
@@ -223,9 +279,8 @@ def bot_detail(bot_id: int):
                     return {"type": "fold"}
 
                 def _make_state_fast(**kwargs):
-                    # Use fewer equity samples for demo matches (20 vs 100)
-                    # This gives ~10% error vs ~5% but is 5x faster
-                    return make_bot_visible_state(**kwargs, equity_samples=20)
+                    # Demo matches use fewer equity samples unless NumPy makes 100 cheap.
+                    return make_bot_visible_state(**kwargs, equity_samples=DEMO_EQUITY_SAMPLES)
 
                 try:
                     result = run_match(
@@ -250,43 +305,44 @@ def bot_detail(bot_id: int):
                 match.hands = int(result.hands)
                 match.seats = int(result.seats)
                 db.session.add(match)
-                db.session.commit()
 
-                # Persist per-hand replay data (board + action history + winners).
-                for hand_index, hr in enumerate(result.hand_results):
-                    db.session.add(
-                        MatchHand(
-                            match_id=match.id,
-                            hand_index=int(hand_index),
-                            hand_seed=int(hr.seed),
-                            dealer_seat=int(hr.dealer_seat),
-                            board_json=json.dumps(hr.board),
-                            actions_json=json.dumps(hr.actions),
-                            winners_json=json.dumps(hr.winners),
-                            delta_stacks_json=json.dumps(hr.delta_stacks),
-                            side_pots_json=json.dumps(hr.side_pots),
-                        )
+                # Persist per-hand replay data (board + action history + winners),
+                # results and per-bot logs/errors as bulk inserts; everything below
+                # is committed once together with the rating update.
+                match_hands = [
+                    MatchHand(
+                        match_id=match.id,
+                        hand_index=int(hand_index),
+                        hand_seed=int(hr.seed),
+                        dealer_seat=int(hr.dealer_seat),
+                        board_json=_je(hr.board),
+                        actions_json=_je(hr.actions),
+                        winners_json=_je(hr.winners),
+                        delta_stacks_json=_je(hr.delta_stacks),
+                        side_pots_json=_je(hr.side_pots),
                     )
-                db.session.commit()
-
-                for seat, b in enumerate(table_bots):
-                    db.session.add(
-                        MatchResult(
-                            match_id=match.id,
-                            bot_id=b.id,
-                            seat=int(seat),
-                            hands_played=int(result.hands),
-                            chips_won=int(result.chips_won[seat]),
-                        )
+                    for hand_index, hr in enumerate(result.hand_results)
+                ]
+                db.session.bulk_save_objects(match_hands)
+
+                match_results = [
+                    MatchResult(
+                        match_id=match.id,
+                        bot_id=b.id,
+                        seat=int(seat),
+                        hands_played=int(result.hands),
+                        chips_won=int(result.chips_won[seat]),
                     )
-                db.session.commit()
+                    for seat, b in enumerate(table_bots)
+                ]
+                db.session.bulk_save_objects(match_results)
 
-                # Persist per-bot logs/errors for match replay/debugging.
+                match_logs: list[MatchBotLog] = []
                 for seat, b in enumerate(table_bots):
                     logs_text = "\n".join(logs_by_seat.get(seat, [])).strip()
                     err_text = "\n".join(errors_by_seat.get(seat, [])).strip()
                     if logs_text or err_text:
-                        db.session.add(
+                        match_logs.append(
                             MatchBotLog(
                                 match_id=match.id,
                                 bot_id=b.id,
@@ -295,7 +351,7 @@ def bot_detail(bot_id: int):
                                 errors=err_text or None,
                             )
                         )
-                db.session.commit()
+                db.session.bulk_save_objects(match_logs)
 
                 # Update Elo ratings for this table based on chips_won.
                 rating_rows: list[Rating] = []
@@ -438,7 +494,7 @@ def live_stream():
                 return {"type": "fold"}
             
             def stream_make_state(**kwargs):
-                return make_bot_visible_state(**kwargs, equity_samples=20)
+                return make_bot_visible_state(**kwargs, equity_samples=DEMO_EQUITY_SAMPLES)
             
             # Run the hand
             try:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 
+from sqlalchemy import insert, literal, select
+
 from .db import Bot, BotVersion, Rating, User, db
 
 
@@ -168,8 +171,10 @@ BAD_BOTS = [
 ]
 
 
+@functools.lru_cache(maxsize=2048)
 def _hash_code(code: str) -> str:
-    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+    # 128-bit BLAKE2b: 32 hex chars, fits the existing code_hash column.
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def _create_bot(user_id: int, name: str, code: str) -> Bot:
@@ -205,8 +210,11 @@ def ensure_seed_data() -> None:
 
 
 def ensure_ratings_exist() -> None:
-    bots = Bot.query.all()
-    for b in bots:
-        if db.session.get(Rating, b.id) is None:
-            db.session.add(Rating(bot_id=b.id, rating=1500.0, matches_played=0))
+    # Single INSERT ... SELECT over bots that have no rating row yet.
+    missing = (
+        select(Bot.id, literal(1500.0), literal(0))
+        .outerjoin(Rating, Rating.bot_id == Bot.id)
+        .where(Rating.bot_id.is_(None))
+    )
+    db.session.execute(insert(Rating).from_select(["bot_id", "rating", "matches_played"], missing))
     db.session.commit()
@@ -42,40 +42,36 @@ def run_match(
         big_blind=match_config.big_blind,
     )
 
-    stacks = [cfg.starting_stack for _ in range(cfg.seats)]
+    seats = cfg.seats
+    stacks = [cfg.starting_stack for _ in range(seats)]
     dealer = 0
     hands: list[HandResult] = []
+    codes = tuple(bot_codes)
+    simulate = simulate_hand
+    hand_seeds = [seed + h * 10_007 for h in range(match_config.hands)]
 
     def next_dealer(current: int, stack_list: list[int]) -> int:
         """Find the next dealer seat, skipping busted players."""
-        for i in range(1, cfg.seats + 1):
-            candidate = (current + i) % cfg.seats
+        for i in range(1, seats + 1):
+            candidate = (current + i) % seats
             if stack_list[candidate] > 0:
                 return candidate
         # Fallback (shouldn't happen if game isn't over)
-        return (current + 1) % cfg.seats
+        return (current + 1) % seats
 
-    for h in range(match_config.hands):
+    # The dealer sequence depends on who busts, so only the seeds are precomputed.
+    for hand_seed in hand_seeds:
         # Check if only one player remains
         players_with_chips = sum(1 for s in stacks if s > 0)
         if players_with_chips <= 1:
             break
-            
-        hand_seed = seed + h * 10_007
-        hr = simulate_hand(
-            bot_codes,
-            seed=hand_seed,
-            config=cfg,
-            dealer_seat=dealer,
-            initial_stacks=stacks,
-            bot_decide=bot_decide,
-            make_state_for_actor=make_state_for_actor,
-        )
+
+        hr = simulate(codes, hand_seed, cfg, dealer, stacks, bot_decide, make_state_for_actor)
         hands.append(hr)
         stacks = hr.final_stacks
         dealer = next_dealer(dealer, stacks)
 
-    chips_won = [stacks[i] - cfg.starting_stack for i in range(cfg.seats)]
+    chips_won = [stacks[i] - cfg.starting_stack for i in range(seats)]
     return MatchResult(
         seed=seed,
         hands=len(hands),  # Actual number of hands played (may end early if one player left)
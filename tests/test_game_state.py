@@ -9,6 +9,7 @@ from holdem_together.game_state import (
     estimate_equity,
     _current_made_hand,
     _make_deck_excluding,
+    _equity_cached,
 )
 
 
@@ -78,6 +79,14 @@ class TestEstimateEquity:
         eq2 = estimate_equity(["As", "Ad"], [], 1, seed=123, samples=50)
         assert eq1 == eq2
 
+    def test_equity_ignores_card_order(self):
+        eq1 = estimate_equity(["Kd", "As"], ["Qs", "7h", "2c"], 2, seed=7, samples=50)
+        hits = _equity_cached.cache_info().hits
+        eq2 = estimate_equity(["As", "Kd"], ["2c", "Qs", "7h"], 2, seed=7, samples=50)
+        assert eq1 == eq2
+        # The reordered call is served from the same cache entry.
+        assert _equity_cached.cache_info().hits == hits + 1
+
     def test_equity_decreases_with_opponents(self):
         eq_1 = estimate_equity(["As", "Ad"], [], 1, seed=42, samples=100)
         eq_3 = estimate_equity(["As", "Ad"], [], 3, seed=42, samples=100)
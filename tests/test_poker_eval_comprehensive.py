@@ -1,13 +1,24 @@
 """Comprehensive tests for poker_eval module - hand ranking and comparison."""
 from __future__ import annotations
 
+import itertools
+import random
+import subprocess
+import sys
+
 import pytest
 
+from holdem_together import poker_eval
 from holdem_together.poker_eval import (
+    FLUSH_LOOKUP,
+    NOFLUSH7,
+    UNSUITED_LOOKUP,
     HandStrength,
+    best_hand,
     best_of_7,
     compare_best_of_7,
     parse_card,
+    parse_cards_to_ints,
     rank_5,
     RANKS,
     SUITS,
@@ -251,6 +262,31 @@ class TestBestOf7:
             best_of_7(["As", "Ks", "Qs"])
 
 
+class TestBestHand:
+    """Tests for evaluating 5 to 7 known cards."""
+
+    def test_five_cards_same_as_rank_5(self):
+        cards = ["Ac", "Ad", "Kh", "Ks", "7c"]
+        assert best_hand(cards) == rank_5(cards)
+
+    def test_six_cards_picks_best_five(self):
+        hand = best_hand(["9h", "Th", "Jh", "Qh", "Kh", "2c"])
+        assert hand.category == "straight_flush"
+        assert hand.rank == (13,)
+
+    def test_seven_cards_same_as_best_of_7(self):
+        cards = ["Ac", "Ad", "Kh", "Ks", "Qc", "Qd", "2h"]
+        assert best_hand(cards) == best_of_7(cards)
+
+    def test_raises_on_too_few_cards(self):
+        with pytest.raises(ValueError):
+            best_hand(["As", "Ks", "Qs", "Js"])
+
+    def test_parse_cards_to_ints_distinct(self):
+        deck = [r + s for r in RANKS for s in SUITS]
+        assert len(set(parse_cards_to_ints(deck))) == 52
+
+
 class TestCompareHands:
     """Tests for comparing hands."""
 
@@ -311,6 +347,19 @@ class TestCompareHands:
         assert compare_best_of_7(aa_king, aa_queen) > 0
 
 
+class TestHandStrengthScore:
+    """Tests for the packed integer score on HandStrength."""
+
+    def test_higher_category_scores_higher(self):
+        assert HandStrength("pair", (2, 5, 4, 3)).score > HandStrength("high_card", (14, 13, 12, 11, 9)).score
+
+    def test_kickers_order_scores(self):
+        assert rank_5(["Ac", "Ad", "Kh", "7s", "2c"]).score > rank_5(["Ac", "Ad", "Qh", "7s", "2c"]).score
+
+    def test_equal_hands_equal_scores(self):
+        assert rank_5(["Ac", "Kd", "7h", "4s", "2c"]).score == rank_5(["Ad", "Kc", "7s", "4h", "2d"]).score
+
+
 class TestCategoryOrder:
     """Test that all categories are ordered correctly."""
 
@@ -339,3 +388,43 @@ class TestCategoryOrder:
                     assert cmp < 0, f"{cat2} should beat {cat1}"
                 else:
                     assert cmp == 0, f"{cat1} should tie {cat1}"
+
+
+class TestLookupTables:
+    """Tests for the precomputed 5-card lookup tables."""
+
+    @pytest.fixture(autouse=True)
+    def _tables(self):
+        # The tables are built on first evaluation, not at import.
+        poker_eval._build_tables()
+
+    def test_import_does_not_build_tables(self):
+        code = "from holdem_together import poker_eval; assert not poker_eval.NOFLUSH7"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_7462_distinct_classes(self):
+        assert len(FLUSH_LOOKUP) + len(UNSUITED_LOOKUP) == 7462
+        scores = set(FLUSH_LOOKUP.values()) | set(UNSUITED_LOOKUP.values())
+        assert scores == set(range(1, 7463))
+
+    def test_extreme_scores(self):
+        assert max(FLUSH_LOOKUP.values()) == 7462  # royal flush
+        assert min(UNSUITED_LOOKUP.values()) == 1  # 7-5-4-3-2 offsuit
+        assert rank_5(["7c", "5d", "4h", "3s", "2c"]).rank == (7, 5, 4, 3, 2)
+
+    def test_noflush7_covers_every_quinary(self):
+        # 13-digit base-5 rank-count vectors summing to 7.
+        assert len(NOFLUSH7) == 49205
+
+    def test_best_of_7_matches_brute_force(self):
+        order = ["high_card", "pair", "two_pair", "three_of_a_kind", "straight",
+                 "flush", "full_house", "four_of_a_kind", "straight_flush"]
+        deck = [r + s for r in RANKS for s in SUITS]
+        rng = random.Random(7)
+        for _ in range(2000):
+            cards = rng.sample(deck, 7)
+            brute = max(
+                (rank_5(list(c)) for c in itertools.combinations(cards, 5)),
+                key=lambda h: (order.index(h.category), h.rank),
+            )
+            assert best_of_7(cards) == brute
@@ -0,0 +1,40 @@
+"""Tests for the optional NumPy batch evaluator."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from holdem_together import game_state, poker_eval
+from holdem_together.poker_eval import CARD_ID
+
+np = pytest.importorskip("numpy")
+
+from holdem_together.poker_eval_np import best_of_7_np  # noqa: E402
+
+
+def test_card_ids_dense():
+    assert sorted(CARD_ID.values()) == list(range(52))
+    assert CARD_ID["2c"] == 0
+    assert CARD_ID["As"] == 51
+
+
+def test_matches_scalar_evaluator():
+    deck = list(CARD_ID)
+    rng = random.Random(5)
+    hands = [rng.sample(deck, 7) for _ in range(2000)]
+    scores = best_of_7_np(np.array([[CARD_ID[c] for c in h] for h in hands], dtype=np.int8))
+    for h, score in zip(hands, scores):
+        assert poker_eval._STRENGTHS[int(score)] == poker_eval.best_of_7(h)
+
+
+def test_vectorized_equity_close_to_scalar(monkeypatch):
+    args = (("As", "Ad"), ("7c", "8d", "2h"), 2, 2000, 9)
+    # game_state only imports NumPy when HOLD_EM_NUMPY_EQUITY is set.
+    monkeypatch.setattr(game_state, "USE_NUMPY_EQUITY", True)
+    monkeypatch.setattr(game_state, "np", np, raising=False)
+    monkeypatch.setattr(game_state, "best_of_7_np", best_of_7_np, raising=False)
+    vectorized = game_state._equity_cached.__wrapped__(*args)
+    monkeypatch.setattr(game_state, "USE_NUMPY_EQUITY", False)
+    scalar = game_state._equity_cached.__wrapped__(*args)
+    assert abs(vectorized - scalar) < 0.05
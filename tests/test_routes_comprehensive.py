@@ -1,12 +1,13 @@
 """Comprehensive tests for Flask routes."""
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 
 import pytest
 
 from holdem_together.app import create_app
-from holdem_together.db import Bot, BotVersion, Match, MatchResult, Rating, User, db
+from holdem_together.db import Bot, BotVersion, Match, MatchHand, MatchResult, Rating, User, db
 
 
 @pytest.fixture
@@ -181,6 +182,40 @@ class TestBotDetailRoute:
             versions = BotVersion.query.filter_by(bot_id=bot_id).all()
             assert len(versions) >= 1
 
+    def test_bot_resubmit_unchanged_code_adds_no_version(self, client, app):
+        with app.app_context():
+            bot = Bot.query.first()
+            bot_id = bot.id
+            before = BotVersion.query.filter_by(bot_id=bot_id).count()
+
+        data = {"action": "submit", "code": "def decide_action(game_state): return {'type': 'call'}"}
+        client.post(f"/bots/{bot_id}", data=data)
+        client.post(f"/bots/{bot_id}", data=data)
+
+        with app.app_context():
+            assert BotVersion.query.filter_by(bot_id=bot_id).count() == before + 1
+
+        client.post(f"/bots/{bot_id}", data={**data, "code": data["code"] + "\n"})
+        with app.app_context():
+            assert BotVersion.query.filter_by(bot_id=bot_id).count() == before + 2
+
+    def test_bot_resubmit_after_sha256_version_adds_no_version(self, client, app):
+        code = "def decide_action(game_state): return {'type': 'call'}"
+        with app.app_context():
+            bot = Bot.query.first()
+            bot_id = bot.id
+            # Versions stored before the switch to BLAKE2b carry SHA-256 hashes.
+            db.session.add(
+                BotVersion(bot_id=bot_id, code_hash=hashlib.sha256(code.encode("utf-8")).hexdigest(), code=code)
+            )
+            db.session.commit()
+            before = BotVersion.query.filter_by(bot_id=bot_id).count()
+
+        client.post(f"/bots/{bot_id}", data={"action": "submit", "code": code})
+
+        with app.app_context():
+            assert BotVersion.query.filter_by(bot_id=bot_id).count() == before
+
     def test_bot_submit_invalid_code_blocked(self, client, app):
         with app.app_context():
             bot = Bot.query.first()
@@ -221,6 +256,22 @@ class TestBotDemoRoute:
         })
         assert response.status_code == 200
 
+    def test_bot_demo_persists_hands_and_results(self, client, app):
+        with app.app_context():
+            bot = Bot.query.filter(Bot.status == "valid").first()
+            bot_id = bot.id
+
+        client.post(f"/bots/{bot_id}", data={
+            "action": "demo",
+            "code": "def decide_action(gs): return {'type': 'check'}",
+        })
+
+        with app.app_context():
+            match = Match.query.order_by(Match.id.desc()).first()
+            assert match.status == "finished"
+            assert MatchHand.query.filter_by(match_id=match.id).count() == match.hands
+            assert MatchResult.query.filter_by(match_id=match.id).count() == match.seats
+
     def test_bot_demo_with_invalid_code(self, client, app):
         with app.app_context():
             bot = Bot.query.first()
@@ -241,6 +292,38 @@ class TestMatchDetailRoute:
         response = client.get("/matches/99999")
         assert response.status_code == 404
 
+    def test_replay_json_same_with_or_without_orjson(self, monkeypatch):
+        from holdem_together import routes
+
+        # orjson writes compact JSON; the stdlib fallback must match it so the
+        # replay text shown on this page doesn't depend on what is installed.
+        monkeypatch.setattr(routes, "orjson", None)
+        assert routes._je({"a": [1, 2], "b": "x"}) == '{"a":[1,2],"b":"x"}'
+
+    def test_replay_json_orjson_matches_stdlib(self, monkeypatch):
+        pytest.importorskip("orjson")
+        from holdem_together import routes
+        from holdem_together.engine import TableConfig, simulate_hand
+        from holdem_together.game_state import make_bot_visible_state
+
+        def shove(code, game_state):
+            return {"type": "raise", "amount": 10**6}
+
+        # Uneven all-ins give a hand with actions and several side pots.
+        hr = simulate_hand(
+            ["a", "b", "c"],
+            seed=3,
+            config=TableConfig(seats=3),
+            initial_stacks=[50, 200, 500],
+            bot_decide=shove,
+            make_state_for_actor=make_bot_visible_state,
+        )
+        assert len(hr.side_pots) > 1
+        payloads = [hr.board, hr.actions, hr.winners, hr.delta_stacks, hr.side_pots]
+        fast = [routes._je(p) for p in payloads]
+        monkeypatch.setattr(routes, "orjson", None)
+        assert [routes._je(p) for p in payloads] == fast
+
     def test_match_detail_with_match(self, client, app):
         with app.app_context():
             # Create a match
@@ -252,6 +335,23 @@ class TestMatchDetailRoute:
         response = client.get(f"/matches/{match_id}")
         assert response.status_code == 200
 
+    def test_match_detail_after_demo_lists_bots(self, client, app):
+        with app.app_context():
+            bot = Bot.query.filter(Bot.status == "valid").first()
+            bot_id, bot_name = bot.id, bot.name
+
+        client.post(f"/bots/{bot_id}", data={
+            "action": "demo",
+            "code": "def decide_action(gs):\n    print('hi')\n    return {'type': 'check'}",
+        })
+
+        with app.app_context():
+            match_id = Match.query.order_by(Match.id.desc()).first().id
+        response = client.get(f"/matches/{match_id}")
+        assert response.status_code == 200
+        assert bot_name.encode() in response.data
+        assert b"Hand 1" in response.data
+
 
 class TestRatingIntegration:
     """Tests for rating integration in routes."""
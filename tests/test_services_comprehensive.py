@@ -33,9 +33,9 @@ class TestHashCode:
         h = _hash_code("test code")
         assert isinstance(h, str)
 
-    def test_hash_is_sha256_length(self):
+    def test_hash_is_blake2b_128_length(self):
         h = _hash_code("test code")
-        assert len(h) == 64  # SHA256 hex digest
+        assert len(h) == 32  # 128-bit BLAKE2b hex digest
 
     def test_same_code_same_hash(self):
         h1 = _hash_code("def decide_action(gs): return {'type': 'check'}")
@@ -50,12 +50,12 @@ class TestHashCode:
     def test_hash_empty_string(self):
         h = _hash_code("")
         assert isinstance(h, str)
-        assert len(h) == 64
+        assert len(h) == 32
 
     def test_hash_unicode(self):
         h = _hash_code("def decide_action(gs): # комментарий\n    return {'type': 'check'}")
         assert isinstance(h, str)
-        assert len(h) == 64
+        assert len(h) == 32
 
 
 class TestBaselineBotCode: